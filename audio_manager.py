@@ -1,14 +1,109 @@
 import numpy as np
 import queue
+import collections
 import sounddevice as sd
 import threading
 import time
 from typing import Callable, Optional
 from pathlib import Path
 import tempfile
-import wave
+import struct
 import os
 
+# Shared read-only "no audio" result, avoids allocating a new empty array
+_EMPTY_F32 = np.empty(0, dtype=np.float32)
+_EMPTY_F32.setflags(write=False)
+
+# Queued by stop() to wake the processing thread immediately
+_SENTINEL = object()
+
+# Seconds stop() waits for a processing thread still busy in process_func
+PROCESS_JOIN_TIMEOUT = 2.0
+
+# Samples converted and written per step when saving, keeps the int16
+# working set small instead of materializing the whole recording
+_WRITE_CHUNK = 1 << 16
+
+# Canonical 44-byte RIFF/WAVE header for PCM data
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+def _wav_header(sample_rate: int, n_samples: int, channels: int = 1, bits: int = 16) -> bytes:
+    """Build the WAV header for n_samples frames of PCM audio"""
+    block_align = channels * bits // 8
+    data_size = n_samples * block_align
+    return _WAV_HEADER.pack(
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits,
+        b'data', data_size
+    )
+
+def _float_to_pcm16(
+    audio_data: np.ndarray,
+    scratch: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Convert float audio in [-1, 1] to int16, clipping instead of wrapping on overflow"""
+    n = audio_data.shape[0]
+    scratch = np.empty(n, dtype=np.float32) if scratch is None else scratch[:n]
+    out = np.empty(n, dtype=np.int16) if out is None else out[:n]
+    np.multiply(audio_data, 32767.0, out=scratch)
+    np.clip(scratch, -32768, 32767, out=scratch)
+    np.rint(scratch, out=scratch)
+    np.copyto(out, scratch, casting='unsafe')
+    return out
+
+def _advance_window(buf: np.ndarray, fill: int, overlap: int) -> int:
+    """Shift the last `overlap` samples of buf[:fill] to the front in place, return the new fill"""
+    tail_start = fill - overlap
+    if tail_start <= 0:
+        return 0
+    np.copyto(buf[:overlap], buf[tail_start:fill])
+    return overlap
+
+class _Decimator:
+    """
+    Windowed-sinc low-pass plus integer decimation, streaming and allocation-free per block.
+    
+    Runs inside the audio callback, adding roughly 50us per 100ms block.
+    The 16-taps-per-phase filter rolls off early (about -0.4 dB at 6 kHz
+    and -9 dB at 7.5 kHz for 48 kHz input).
+    """
+    
+    def __init__(self, factor: int, out_block: int, taps_per_phase: int = 16):
+        self.factor = factor
+        n_taps = taps_per_phase * factor
+        # Cut off just below the output Nyquist frequency
+        cutoff = 0.9 / factor
+        t = np.arange(n_taps) - (n_taps - 1) / 2
+        taps = cutoff * np.sinc(cutoff * t) * np.hamming(n_taps)
+        self._taps = (taps / taps.sum())[::-1].astype(np.float32)
+        self._hist = n_taps - 1
+        # Filter history followed by the current input block
+        self._work = np.zeros(self._hist + out_block * factor, dtype=np.float32)
+        self._out = np.empty(out_block, dtype=np.float32)
+        
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filter and decimate one block; the result is reused by the next call"""
+        n_in = block.shape[0]
+        n_out = n_in // self.factor
+        work = self._work
+        work[self._hist:self._hist + n_in] = block
+        
+        # Only output samples are computed: row i of the strided view is the
+        # input window ending at output sample i, so one matmul applies the
+        # filter (matmul, unlike dot, doesn't copy the view to contiguous)
+        step = work.strides[0]
+        windows = np.lib.stride_tricks.as_strided(
+            work, shape=(n_out, self._taps.shape[0]),
+            strides=(step * self.factor, step), writeable=False
+        )
+        out = self._out[:n_out]
+        np.matmul(windows, self._taps, out=out)
+        
+        # Carry the tail over as history for the next block
+        np.copyto(work[:self._hist], work[n_in:n_in + self._hist])
+        return out
+
 class AudioManager:
     """Handles audio capture and processing with options for post-recording transcription."""
     
@@ -17,7 +112,9 @@ class AudioManager:
         sample_rate: int = 16000, 
         chunk_duration: float = 2.0,
         device: Optional[int] = None,
-        record_dir: Optional[str] = None
+        record_dir: Optional[str] = None,
+        debug: bool = False,
+        native_capture: bool = False
     ):
         self.sample_rate = sample_rate
         self.channels = 1
@@ -26,31 +123,88 @@ class AudioManager:
         self.chunk_size = int(sample_rate * chunk_duration)
         self.overlap = int(sample_rate * 0.5)  # 0.5 second overlap
         self.device = device
+        self._block_samples = int(sample_rate * 0.1)  # 100ms stream blocks
+        
+        # Bounded so a stalled consumer can't grow memory without limit;
+        # the callback drops the oldest block when full (~3.2s of audio)
+        self.audio_queue = queue.Queue(maxsize=32)
         
-        self.audio_queue = queue.Queue()
+        # Pool of reusable block buffers so the callback doesn't allocate;
+        # the consumer hands each buffer back once it has been copied out
+        self._buf_pool = queue.LifoQueue()
+        for _ in range(8):
+            self._buf_pool.put(np.empty(self._block_samples, dtype=self.dtype))
         self.stream = None
         self.is_running = False
         self.processing_thread = None
+        self._stop_event = threading.Event()
+        self.debug = debug
         
-        # Buffer for continuous recording
-        self.accumulated_audio = np.array([], dtype=self.dtype)
+        # Capture at the device's native rate and decimate here rather than
+        # letting PortAudio resample (only for integer multiples of sample_rate)
+        self.native_capture = native_capture
+        self._decimator = None
         
-        # For full recordings
-        self.recording_buffer = np.array([], dtype=self.dtype)
+        # Stream status flags are queued here by the callback and printed from
+        # outside the audio thread, so the callback never touches stdout
+        self._status_log = collections.deque(maxlen=256)
+        
+        # For full recordings: pre-allocated buffer plus write cursor, grown by
+        # doubling so appends from the audio callback are amortized O(1)
+        self._rec_capacity = sample_rate * 60
+        self._rec_buf = np.empty(self._rec_capacity, dtype=self.dtype)
+        self._rec_len = 0
+        self._rec_shared = False  # Set once a view of _rec_buf has been handed out
         self.is_recording = False
         self.record_dir = record_dir if record_dir else tempfile.gettempdir()
+        os.makedirs(self.record_dir, exist_ok=True)
         self.current_recording_path = None
         
     def audio_callback(self, indata, frames, time, status):
         """Callback function for audio stream"""
         if status:
-            print(f"Audio status: {status}")
-        audio_data = indata.copy()
-        self.audio_queue.put(audio_data)
+            self._status_log.append(status)
+        
+        # 1-D view of the single input channel; consumed before returning
+        mono = indata[:, 0]
+        if self._decimator is not None:
+            mono = self._decimator.process(mono)
+        n = mono.shape[0]
+        try:
+            audio_data = self._buf_pool.get_nowait()
+        except queue.Empty:
+            audio_data = np.empty(n, dtype=self.dtype)
+        if audio_data.shape[0] != n:
+            audio_data = np.empty(n, dtype=self.dtype)
+        np.copyto(audio_data, mono)
+        try:
+            self.audio_queue.put_nowait(audio_data)
+        except queue.Full:
+            # Drop the oldest block rather than block the audio thread
+            try:
+                oldest = self.audio_queue.get_nowait()
+                if oldest is not _SENTINEL:
+                    self._buf_pool.put_nowait(oldest)
+                self.audio_queue.put_nowait(audio_data)
+            except (queue.Empty, queue.Full):
+                pass
         
         # Also add to recording buffer if recording mode is active
         if self.is_recording:
-            self.recording_buffer = np.append(self.recording_buffer, audio_data.flatten())
+            self._append_recording(mono)
+    
+    def _append_recording(self, flat: np.ndarray):
+        """Append samples to the recording buffer, doubling capacity when full"""
+        n = flat.shape[0]
+        needed = self._rec_len + n
+        if needed > self._rec_capacity:
+            new_capacity = max(2 * self._rec_capacity, needed)
+            new_buf = np.empty(new_capacity, dtype=self.dtype)
+            np.copyto(new_buf[:self._rec_len], self._rec_buf[:self._rec_len])
+            self._rec_buf = new_buf
+            self._rec_capacity = new_capacity
+        self._rec_buf[self._rec_len:needed] = flat
+        self._rec_len = needed
         
     def start(self, process_func: Optional[Callable[[np.ndarray], None]] = None):
         """Start audio capture and processing"""
@@ -58,28 +212,43 @@ class AudioManager:
             return
             
         self.is_running = True
-        self.accumulated_audio = np.array([], dtype=self.dtype)
         
         # Start processing thread if real-time processing is requested
         if process_func:
+            # Fresh event per thread so a stale thread can't see it cleared
+            self._stop_event = threading.Event()
             self.processing_thread = threading.Thread(
                 target=self._process_audio_thread,
-                args=(process_func,),
+                args=(process_func, self._stop_event),
                 daemon=True
             )
             self.processing_thread.start()
         
         # Start audio stream
+        factor = self._native_decimation_factor() if self.native_capture else 1
+        self._decimator = _Decimator(factor, self._block_samples) if factor > 1 else None
         self.stream = sd.InputStream(
             channels=self.channels,
-            samplerate=self.sample_rate,
+            samplerate=self.sample_rate * factor,
             dtype=self.dtype,
             callback=self.audio_callback,
-            blocksize=int(self.sample_rate * 0.1),  # Process in 100ms chunks
+            blocksize=self._block_samples * factor,  # Process in 100ms chunks
             device=self.device
         )
         self.stream.start()
         
+    def _native_decimation_factor(self) -> int:
+        """Ratio of the input device's native rate to sample_rate, or 1 if not an integer"""
+        try:
+            info = sd.query_devices(self.device, 'input')
+            native = int(info['default_samplerate'])
+        except Exception as e:
+            print(f"Could not query native sample rate: {e}")
+            return 1
+        if native > self.sample_rate and native % self.sample_rate == 0:
+            return native // self.sample_rate
+        return 1
+        
     def stop(self):
         """Stop audio capture and processing"""
         if not self.is_running:
@@ -91,35 +260,84 @@ class AudioManager:
             self.stream.stop()
             self.stream.close()
             self.stream = None
-            
-        # Clear queue
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
-                
-        # Reset buffer
-        self.accumulated_audio = np.array([], dtype=self.dtype)
+        self._flush_status()
+        self._clear_queue()
+        
+        # Wake the processing thread so it exits without waiting for audio;
+        # if it is busy in process_func, wait for that only up to a bound
+        self._stop_event.set()
+        thread = self.processing_thread
+        if thread and thread.is_alive():
+            self.audio_queue.put_nowait(_SENTINEL)
+            if thread is not threading.current_thread():
+                thread.join(timeout=PROCESS_JOIN_TIMEOUT)
+        self.processing_thread = None
+        
+    def _clear_queue(self):
+        """Clear the audio queue atomically and hand the buffers back to the pool"""
+        q = self.audio_queue
+        with q.mutex:
+            drained = list(q.queue)
+            q.queue.clear()
+            q.unfinished_tasks = 0
+            q.all_tasks_done.notify_all()
+            q.not_full.notify_all()
+        for audio_data in drained:
+            if audio_data is not _SENTINEL:
+                self._buf_pool.put_nowait(audio_data)
         
-    def _process_audio_thread(self, process_func: Callable[[np.ndarray], None]):
+    def _flush_status(self):
+        """Print stream status flags queued by the audio callback"""
+        while self._status_log:
+            print(f"Audio status: {self._status_log.popleft()}")
+        
+    def _process_audio_thread(
+        self,
+        process_func: Callable[[np.ndarray], None],
+        stop_event: threading.Event
+    ):
         """Thread function to process audio chunks (for real-time mode)"""
-        while self.is_running:
+        # Bind loop invariants to locals to skip attribute lookups per block
+        get = self.audio_queue.get
+        release = self._buf_pool.put_nowait
+        chunk_size = self.chunk_size
+        overlap = self.overlap
+        
+        # Sliding window for continuous processing: one chunk plus room for a
+        # single incoming block, filled in place via a write index. Owned by
+        # this thread so a stale thread finishing process_func after a
+        # restart can't touch the new thread's window
+        win = np.empty(chunk_size + self._block_samples, dtype=self.dtype)
+        fill = 0
+        
+        while not stop_event.is_set():
             try:
-                # Get audio chunk from queue with timeout
-                audio_chunk = self.audio_queue.get(timeout=0.5).flatten()
-                self.accumulated_audio = np.concatenate((self.accumulated_audio, audio_chunk))
+                # Block until audio arrives or stop() queues the sentinel
+                audio_chunk = get()
+                if audio_chunk is _SENTINEL:
+                    # Left behind if the previous thread outlived the join
+                    # timeout in stop(); only our own stop ends this loop
+                    if stop_event.is_set():
+                        break
+                    continue
+                n = audio_chunk.shape[0]
+                win[fill:fill + n] = audio_chunk
+                fill += n
+                release(audio_chunk)
                 
                 # Process when we have enough audio
-                if len(self.accumulated_audio) >= self.chunk_size:
-                    print(f"Processing audio chunk of length: {len(self.accumulated_audio)}")
+                if fill >= chunk_size:
+                    self._flush_status()
                     
-                    # Use a copy for processing
-                    audio_to_process = self.accumulated_audio[:self.chunk_size].copy()
+                    # Use a copy for processing, the window is reused in place
+                    audio_to_process = win[:chunk_size].copy()
                     
                     # Check audio quality
-                    max_val = np.max(np.abs(audio_to_process))
-                    print(f"Audio max amplitude: {max_val:.4f}")
+                    if self.debug:
+                        print(f"Processing audio chunk of length: {fill}")
+                        # Two reductions, but no |x| temporary
+                        max_val = max(-audio_to_process.min(), audio_to_process.max())
+                        print(f"Audio max amplitude: {max_val:.4f}")
                     
                     # Send to callback function
                     try:
@@ -127,17 +345,19 @@ class AudioManager:
                     except Exception as e:
                         print(f"Error in audio processing: {e}")
                     
-                    # Keep a small overlap
-                    self.accumulated_audio = self.accumulated_audio[-self.overlap:] if len(self.accumulated_audio) > self.overlap else np.array([], dtype=self.dtype)
-            except queue.Empty:
-                continue
+                    # Keep a small overlap from the end of the window
+                    fill = _advance_window(win, fill, overlap)
             except Exception as e:
                 print(f"Error processing audio: {e}")
                 
     def start_recording(self):
         """Start recording a full audio session"""
         print("Starting full audio recording...")
-        self.recording_buffer = np.array([], dtype=self.dtype)
+        if self._rec_shared:
+            # Views returned for the previous recording must stay intact
+            self._rec_buf = np.empty(self._rec_capacity, dtype=self.dtype)
+            self._rec_shared = False
+        self._rec_len = 0
         self.is_recording = True
         
         # Make sure audio capture is active
@@ -145,22 +365,37 @@ class AudioManager:
             self.start(None)  # Start without real-time processing
         
     def stop_recording(self) -> np.ndarray:
-        """Stop recording and return the buffer"""
+        """
+        Stop recording and return the buffer.
+        
+        The returned array is a read-only view; call .copy() before modifying it.
+        """
         if not self.is_recording:
-            return np.array([])
+            return _EMPTY_F32
             
-        print(f"Stopping recording... Captured {len(self.recording_buffer)} samples ({len(self.recording_buffer)/self.sample_rate:.2f}s)")
+        print(f"Stopping recording... Captured {self._rec_len} samples ({self._rec_len/self.sample_rate:.2f}s)")
         self.is_recording = False
-        return self.recording_buffer.copy()
+        return self._recording_view()
     
     def get_recording(self) -> np.ndarray:
-        """Get the current recording buffer without stopping recording"""
-        return self.recording_buffer.copy()
+        """
+        Get the current recording buffer without stopping recording.
+        
+        The returned array is a read-only view; call .copy() before modifying it.
+        """
+        return self._recording_view()
+    
+    def _recording_view(self) -> np.ndarray:
+        """Read-only view of the samples recorded so far"""
+        view = self._rec_buf[:self._rec_len]
+        view.setflags(write=False)
+        self._rec_shared = True
+        return view
     
     def save_recording(self, audio_data: Optional[np.ndarray] = None, filename: Optional[str] = None) -> str:
         """Save recording to WAV file"""
         if audio_data is None:
-            audio_data = self.recording_buffer
+            audio_data = self._rec_buf[:self._rec_len]
             
         if len(audio_data) == 0:
             print("No audio data to save")
@@ -173,17 +408,15 @@ class AudioManager:
             
         # Create full path
         filepath = os.path.join(self.record_dir, filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
-        # Convert float32 to int16 for WAV file
-        int_data = (audio_data * 32767).astype(np.int16)
         
-        # Write WAV file
-        with wave.open(filepath, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)  # 2 bytes for int16
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(int_data.tobytes())
+        # Write WAV file, converting float32 to int16 one chunk at a time
+        scratch = np.empty(min(len(audio_data), _WRITE_CHUNK), dtype=np.float32)
+        int_chunk = np.empty(scratch.shape[0], dtype=np.int16)
+        with open(filepath, 'wb') as f:
+            f.write(_wav_header(self.sample_rate, len(audio_data)))
+            for start in range(0, len(audio_data), _WRITE_CHUNK):
+                chunk = audio_data[start:start + _WRITE_CHUNK]
+                f.write(_float_to_pcm16(chunk, scratch, int_chunk))
             
         print(f"Recording saved to {filepath}")
         self.current_recording_path = filepath
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 import os
+import subprocess
 import sys
 import time
 import threading
 import numpy as np
 import queue
 import argparse
+import logging
 from pathlib import Path
 from typing import Optional
 from pynput import keyboard
@@ -30,6 +32,15 @@ TOGGLE_COMBOS = [
     {keyboard.Key.f12},
 ]
 
+# One bit per key used in any toggle combo, so matching is a mask test
+_COMBO_KEYS = list(dict.fromkeys(key for combo in TOGGLE_COMBOS for key in combo))
+KEY_BITS = {key: 1 << i for i, key in enumerate(_COMBO_KEYS)}
+COMBO_MASKS = [sum(KEY_BITS[key] for key in combo) for combo in TOGGLE_COMBOS]
+
+# A held bit with no press event for this long is left over from a missed
+# release rather than auto-repeat (macOS waits at most ~1.8s before repeating)
+KEY_STALE_AFTER = 2.0
+
 class SpeechTranscriber:
     """Main application class for speech transcription."""
     
@@ -38,7 +49,9 @@ class SpeechTranscriber:
         self.is_active = False
         self.is_running = True
         self.is_recording = False
-        self.current_keys = set()
+        self._pressed_mask = 0  # Bits from KEY_BITS for combo keys held down
+        self._last_press = {}  # Bit -> time.monotonic() of its latest press event
+        self._save_thread = None  # Background WAV writer for the last recording
         
         # Create output directory
         os.makedirs(RECORDING_DIR, exist_ok=True)
@@ -70,7 +83,6 @@ class SpeechTranscriber:
         print("If this is your first run, please grant these permissions when prompted.")
         
         # Determine the terminal application
-        import subprocess
         terminal_app = subprocess.check_output("ps -p $PPID -o comm=", shell=True).decode().strip()
         print(f"\nYou are running this script in: {terminal_app}")
         print(f"Please ensure that {terminal_app} has BOTH microphone and accessibility permissions in System Settings > Privacy & Security")
@@ -107,6 +119,7 @@ class SpeechTranscriber:
             self.is_running = False
             if self.keyboard_listener:
                 self.keyboard_listener.stop()
+            self._wait_for_save()
             self.audio_manager.stop()
             self.transcriber.unload_model()
     
@@ -127,6 +140,12 @@ class SpeechTranscriber:
             print(f"Error accessing microphone: {e}")
             print("Please grant microphone permissions to your Terminal application")
     
+    def _wait_for_save(self):
+        """Block until the background WAV write, if any, has finished."""
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._save_thread = None
+    
     def toggle(self):
         """Toggle recording/transcription on/off."""
         if self.is_recording:
@@ -140,12 +159,21 @@ class SpeechTranscriber:
                 audio_duration = len(audio_data) / SAMPLE_RATE
                 print(f"Captured {audio_duration:.2f} seconds of audio")
                 
-                # Save the recording
-                file_path = self.audio_manager.save_recording()
+                # Save the recording in the background, overlapping the
+                # WAV write with model inference on the same in-memory audio
+                self._wait_for_save()
+                self._save_thread = threading.Thread(
+                    target=self.audio_manager.save_recording,
+                    args=(audio_data,)
+                )
+                self._save_thread.start()
                 
                 # Transcribe the full recording
                 result = self.transcriber.transcribe_full_recording(audio_data)
                 
+                # Let the WAV finish before the stream goes away
+                self._wait_for_save()
+                
                 # Stop the audio stream
                 self.audio_manager.stop()
                 
@@ -174,13 +202,25 @@ class SpeechTranscriber:
     def on_key_press(self, key):
         """Handle key press events for hotkey detection."""
         # print(f"Key pressed: {key}")  # Debug: Print every key press
-        self.current_keys.add(key)
+        bit = KEY_BITS.get(key)
+        if not bit:
+            return
+            
+        # A press for a key already held is auto-repeat; the timestamp only
+        # expires bits whose release event was missed. Refreshing it on every
+        # repeat keeps a long hold from looking stale
+        now = time.monotonic()
+        last = self._last_press.get(bit, 0.0)
+        self._last_press[bit] = now
+        if self._pressed_mask & bit and now - last < KEY_STALE_AFTER:
+            return
+        self._pressed_mask |= bit
         
         # Check if any of our toggle combinations match
-        for combo in TOGGLE_COMBOS:
-            if self.current_keys.issuperset(combo):
+        for mask in COMBO_MASKS:
+            if (self._pressed_mask & mask) == mask:
                 if not hasattr(self, 'last_toggle_time') or time.time() - self.last_toggle_time > 0.5:
-                   # print(f"Toggle key combination detected! {combo}")
+                   # print(f"Toggle key combination detected! {mask:#x}")
                     self.toggle()
                     # Debounce toggle to prevent double-activation
                     self.last_toggle_time = time.time()
@@ -188,11 +228,9 @@ class SpeechTranscriber:
     
     def on_key_release(self, key):
         """Handle key release events."""
-        try:
-
-            self.current_keys.remove(key)
-        except KeyError:
-            pass
+        bit = KEY_BITS.get(key)
+        if bit:
+            self._pressed_mask &= ~bit
 
 def transcribe_file(file_path, output_file=None, print_output=False):
     """
@@ -264,8 +302,14 @@ def main():
     parser.add_argument("--file", "-f", help="Path to audio file to transcribe")
     parser.add_argument("--output", "-o", help="Path to save transcription as text file")
     parser.add_argument("--print", "-p", action="store_true", help="Print the transcription to terminal")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Only log transcriber warnings and errors")
     args = parser.parse_args()
     
+    # Transcriber status goes through logging; --quiet mutes the per-call info.
+    # Only our logger is raised to INFO so third-party libraries stay quiet
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("transcriber").setLevel(logging.WARNING if args.quiet else logging.INFO)
+    
     if args.file:
         # File transcription mode
         transcribe_file(args.file, args.output, args.print)
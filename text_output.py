@@ -1,14 +1,34 @@
-from pynput.keyboard import Controller
+from pynput.keyboard import Controller, Key
+import os
 import re
+import subprocess
+import threading
 import time
 from typing import Optional
 
+# Characters after which no space is needed before the next chunk
+_SENTENCE_ENDS = frozenset('.!?\t\n\r ')
+# Characters that attach to the previous chunk without a space
+_LEADING_PUNCT = frozenset('.,;:!?')
+_SENTENCE_SPLIT = re.compile(r'([.!?]\s+)')
+
+# Text longer than this is pasted via the clipboard instead of typed key by key
+PASTE_THRESHOLD = 32
+# Seconds to wait after Cmd+V before putting the user's clipboard back
+CLIPBOARD_RESTORE_DELAY = 0.5
+
 class TextOutput:
     """Handles keyboard output to the active text field."""
     
-    def __init__(self):
+    def __init__(self, use_clipboard: bool = True):
         self.keyboard = Controller()
         self.last_text = ""
+        self.use_clipboard = use_clipboard
+        
+        # Clipboard contents from before our paste, restored after a delay
+        self._saved_clipboard = None
+        self._restore_timer = None
+        self._clipboard_lock = threading.Lock()
         
     def type_text(self, text: str, smart_spacing: bool = True):
         """
@@ -25,19 +45,86 @@ class TextOutput:
         clean_text = text.strip()
         
         # Add appropriate spacing if enabled
-        if smart_spacing and self.last_text:
-            # Check if we need to add space or if we have end of sentence punctuation
-            last_char = self.last_text[-1] if self.last_text else ""
-            if not (last_char.isspace() or last_char in ".!?"):
-                if not (clean_text[0] in ".,;:!?"):
-                    clean_text = " " + clean_text
+        # Check if we need to add space or if we have end of sentence punctuation
+        if (smart_spacing and self.last_text
+                and self.last_text[-1] not in _SENTENCE_ENDS
+                and clean_text[0] not in _LEADING_PUNCT):
+            clean_text = " " + clean_text
                     
         # Keep track of last text we typed
         self.last_text = clean_text
         
-        # Type the text
+        # Paste long text in one shot, type short text directly
+        if self.use_clipboard and len(clean_text) > PASTE_THRESHOLD and self._paste(clean_text):
+            return
         self.keyboard.type(clean_text)
         
+    def _paste(self, text: str) -> bool:
+        """
+        Paste text by placing it on the clipboard and sending Cmd+V.
+        
+        The previous clipboard contents are restored shortly afterwards.
+        
+        Returns:
+            False if the clipboard could not be set (e.g. pbcopy unavailable)
+        """
+        with self._clipboard_lock:
+            if self._restore_timer is not None:
+                # A restore is still pending, so the clipboard holds our last
+                # paste; keep the original contents saved from before it
+                self._restore_timer.cancel()
+                self._restore_timer = None
+            else:
+                self._saved_clipboard = self._read_clipboard()
+                
+            if not self._write_clipboard(text.encode("utf-8")):
+                return False
+                
+            with self.keyboard.pressed(Key.cmd):
+                self.keyboard.press('v')
+                self.keyboard.release('v')
+                
+            # The target app reads the clipboard asynchronously, so give it
+            # time to handle Cmd+V before restoring
+            if self._saved_clipboard is not None:
+                self._restore_timer = threading.Timer(CLIPBOARD_RESTORE_DELAY, self._restore_clipboard)
+                self._restore_timer.daemon = True
+                self._restore_timer.start()
+        return True
+        
+    def _restore_clipboard(self):
+        """Put back the clipboard contents saved before the last paste"""
+        with self._clipboard_lock:
+            if self._saved_clipboard is not None:
+                self._write_clipboard(self._saved_clipboard)
+            self._saved_clipboard = None
+            self._restore_timer = None
+        
+    def _read_clipboard(self) -> Optional[bytes]:
+        """Current clipboard text, or None if it can't be read"""
+        try:
+            return subprocess.run(
+                ["pbpaste"],
+                capture_output=True,
+                env={**os.environ, "LC_CTYPE": "UTF-8"},
+                check=True
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+            
+    def _write_clipboard(self, data: bytes) -> bool:
+        """Replace the clipboard text, returning False on failure"""
+        try:
+            subprocess.run(
+                ["pbcopy"],
+                input=data,
+                env={**os.environ, "LC_CTYPE": "UTF-8"},
+                check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return False
+        return True
+        
     def type_text_with_format(self, text: str, capitalize_sentences: bool = True):
         """
         Type text with auto-formatting.
@@ -55,7 +142,7 @@ class TextOutput:
         # Capitalize sentences if enabled
         if capitalize_sentences:
             # Split into sentences and capitalize each one
-            sentences = re.split(r'([.!?]\s+)', clean_text)
+            sentences = _SENTENCE_SPLIT.split(clean_text)
             for i in range(0, len(sentences), 2):
                 if i < len(sentences):
                     sentences[i] = sentences[i].capitalize()
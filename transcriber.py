@@ -1,10 +1,143 @@
+import collections
+import contextlib
+import dataclasses
+import functools
+import logging
 import numpy as np
 import torch
 import whisper
 import time
 import os
+import sys
+import threading
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable, Union
+from typing import Optional, Dict, Any, Callable, ContextManager, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Decoding options for short streaming chunks: greedy with no temperature
+# fallback, no prompt carry-over between calls and no timestamp tokens
+STREAMING_DECODE_OPTIONS = {
+    "temperature": 0.0,
+    "condition_on_previous_text": False,
+    "without_timestamps": True,
+}
+
+# On CUDA, recordings longer than this (seconds) are transcribed as 30s
+# windows whose encoder passes run BATCH_WINDOWS at a time
+BATCHED_MIN_DURATION = 120.0
+BATCH_WINDOWS = 8
+
+# Temperatures a batched window is re-decoded at when greedy output looks
+# like a repetition loop or low confidence, as in model.transcribe
+FALLBACK_TEMPERATURES = (0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Streaming chunks passed to submit_chunk within this many seconds of each
+# other are encoded together, up to CHUNK_BATCH_SIZE per encoder pass
+CHUNK_BATCH_WINDOW = 0.02
+CHUNK_BATCH_SIZE = 8
+
+# Size in samples (30s at 16 kHz) of the pinned host buffer CUDA uploads
+# are staged through
+STAGING_SAMPLES = 16000 * 30
+
+# Loaded models shared across Transcriber instances and unload/load cycles,
+# keyed by everything that affects the loaded weights. Each entry is
+# (model, lock); Whisper's decode hooks the shared kv-cache modules, so
+# instances sharing a model must also share the lock that serializes it
+_MODEL_CACHE: Dict[Tuple, Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _hann_window(n_fft: int, device: torch.device) -> torch.Tensor:
+    """STFT window, built once per device instead of on every mel computation."""
+    # A normal tensor even if first requested under inference_mode, so it
+    # can be reused by callers outside it
+    with torch.inference_mode(False):
+        return torch.hann_window(n_fft, device=device)
+
+def _audio_tensor(audio: np.ndarray, padding: int = 0) -> torch.Tensor:
+    """
+    Copy audio into a new float32 tensor followed by `padding` zeros.
+    
+    Unlike torch.from_numpy this accepts read-only arrays, such as the
+    recording views AudioManager returns, and it pads in the same copy.
+    """
+    n = len(audio)
+    tensor = torch.empty(n + padding, dtype=torch.float32)
+    tensor.numpy()[:n] = audio
+    tensor[n:].zero_()
+    return tensor
+
+def _log_mel_spectrogram(
+    audio: Union[str, np.ndarray, torch.Tensor],
+    n_mels: int = 80,
+    padding: int = 0,
+    device: Optional[Union[str, torch.device]] = None
+) -> torch.Tensor:
+    """whisper.audio.log_mel_spectrogram with the Hann window cached per device."""
+    from whisper.audio import HOP_LENGTH, N_FFT, load_audio, mel_filters
+    
+    if not torch.is_tensor(audio):
+        if isinstance(audio, str):
+            audio = load_audio(audio)
+        # Pad while copying on the host, but upload only the samples
+        host_padding = padding if device is None else 0
+        audio = _audio_tensor(audio, host_padding)
+        padding -= host_padding
+    if device is not None:
+        audio = audio.to(device)
+    if padding > 0:
+        audio = torch.nn.functional.pad(audio, (0, padding))
+        
+    window = _hann_window(N_FFT, audio.device)
+    stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=window, return_complex=True)
+    magnitudes = stft[..., :-1].abs() ** 2
+    
+    # mel_filters is already cached per (device, n_mels) by Whisper
+    mel_spec = mel_filters(audio.device, n_mels) @ magnitudes
+    log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+    log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+def _needs_fallback(decoded: Any) -> bool:
+    """model.transcribe's default test for retrying a window at a higher temperature."""
+    if decoded.no_speech_prob > 0.6:
+        # Likely silence, which the caller drops anyway
+        return False
+    return decoded.compression_ratio > 2.4 or decoded.avg_logprob < -1.0
+
+def _install_fast_mel():
+    """Route Whisper's mel computation through _log_mel_spectrogram."""
+    # whisper.transcribe imports the function by name, and the package
+    # attribute of the same name is the transcribe() function, not the module
+    whisper.audio.log_mel_spectrogram = _log_mel_spectrogram
+    sys.modules["whisper.transcribe"].log_mel_spectrogram = _log_mel_spectrogram
+    whisper.log_mel_spectrogram = _log_mel_spectrogram
+
+def _read_wav(file_path: str, sample_rate: int = 16000) -> Optional[np.ndarray]:
+    """
+    Decode a 16-bit PCM WAV at sample_rate into mono float32 in [-1, 1].
+    
+    Returns:
+        The samples, or None if the file needs ffmpeg (other format or rate)
+    """
+    try:
+        with wave.open(file_path, 'rb') as wf:
+            if wf.getsampwidth() != 2 or wf.getframerate() != sample_rate:
+                return None
+            channels = wf.getnchannels()
+            frames = wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError):
+        return None
+        
+    audio = np.frombuffer(frames, dtype='<i2').astype(np.float32)
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
 
 class Transcriber:
     """Handles transcription using the Whisper model."""
@@ -15,14 +148,29 @@ class Transcriber:
         device: str = "cpu",  # Force CPU by default for compatibility
         language: str = "en",
         compute_type: str = "float16",
-        models_dir: Optional[str] = None
+        models_dir: Optional[str] = None,
+        backend: str = "whisper",
+        num_threads: Optional[int] = None
     ):
         self.model_name = model_name
+        self.backend = backend  # "whisper" (openai-whisper) or "faster-whisper" (CTranslate2)
         self.model = None
         self.language = language
         self.compute_type = compute_type
         self.device = self._get_device() if device is None else device
+        
+        # Precision used for inference, resolved once from compute_type/device;
+        # bfloat16 needs Ampere or newer and falls back to float16 otherwise
+        self._bf16 = False
+        if self.compute_type == "bfloat16" and self.device == "cuda":
+            self._bf16 = torch.cuda.is_bf16_supported()
+            if not self._bf16:
+                logger.warning("bfloat16 is not supported on this GPU, using float16")
+        self._fp16 = (self.compute_type in ("float16", "bfloat16") and self.device == "cuda"
+                      and not self._bf16)
+        self._dtype = torch.bfloat16 if self._bf16 else torch.float16 if self._fp16 else torch.float32
         self.models_dir = Path(models_dir) if models_dir else None
+        self.num_threads = num_threads  # CPU intra-op threads, None keeps the library default
         
         # Callback for when transcription is ready
         self.transcription_callback = None
@@ -32,6 +180,27 @@ class Transcriber:
         self.is_processing = False
         self.last_inference_time = 0
         
+        # Serializes model use, swapped for the cache entry's lock on load so
+        # instances sharing a model share it; submit_transcribe queues onto a
+        # single worker
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcriber")
+        
+        # Pending (audio, future) pairs from submit_chunk and the timer that
+        # flushes them once the coalescing window closes
+        self._chunk_queue = collections.deque()
+        self._batch_timer = None
+        self._batch_lock = threading.Lock()
+        
+        # Reused float32 scratch for process_audio, sized for Whisper's 30s window
+        self._audio_scratch = np.zeros(16000 * 30, dtype=np.float32)
+        
+        # Pinned host staging buffer for CUDA uploads (STAGING_SAMPLES long),
+        # allocated on first use, and an event marking when its last upload
+        # has finished reading it
+        self._pinned = None
+        self._pinned_ready = None
+        
     def _get_device(self) -> str:
         """Determine optimal device for inference."""
         if torch.cuda.is_available():
@@ -45,7 +214,19 @@ class Transcriber:
         if self.is_loaded:
             return
             
-        print(f"Loading Whisper model '{self.model_name}' on {self.device}...")
+        if self.device == "cpu":
+            self._configure_cpu_threads()
+            
+        cache_key = self._cache_key()
+        with _MODEL_CACHE_LOCK:
+            cached = _MODEL_CACHE.get(cache_key)
+        if cached is not None:
+            self.model, self._lock = cached
+            self.is_loaded = True
+            logger.info("Using cached Whisper model '%s' on %s", self.model_name, self.device)
+            return
+            
+        logger.info("Loading Whisper model '%s' on %s (%s)...", self.model_name, self.device, self.backend)
         load_start = time.time()
         
         # Set download directory if specified
@@ -55,26 +236,237 @@ class Transcriber:
             
         # Load the model
         try:
-            self.model = whisper.load_model(
-                self.model_name,
-                device=self.device,
-                **kwargs
-            )
+            if self.backend == "faster-whisper":
+                # Optional dependency, int8 GEMM kernels on CPU
+                from faster_whisper import WhisperModel
+                self.model = WhisperModel(
+                    self.model_name,
+                    device=self.device,
+                    compute_type="int8" if self.device == "cpu" else "float16",
+                    cpu_threads=(self.num_threads or 0) if self.device == "cpu" else 0,
+                    **kwargs
+                )
+            else:
+                _install_fast_mel()
+                self.model = whisper.load_model(
+                    self.model_name,
+                    device=self.device,
+                    **kwargs
+                )
+                if self.device == "cpu" and self.compute_type in ("int8", "dynamic_int8"):
+                    self._quantize_linear_layers()
+                if self._bf16:
+                    self._cast_to_bfloat16()
+                if self.device == "cuda" and hasattr(torch, "compile"):
+                    self._compile_encoder()
             self.is_loaded = True
+            with _MODEL_CACHE_LOCK:
+                _MODEL_CACHE[cache_key] = (self.model, self._lock)
             load_time = time.time() - load_start
-            print(f"Model loaded in {load_time:.2f}s")
+            logger.info("Model loaded in %.2fs", load_time)
         except Exception as e:
-            print(f"Error loading model: {e}")
+            logger.error("Error loading model: %s", e)
             
-    def unload_model(self):
-        """Unload model to free memory."""
+    def _configure_cpu_threads(self):
+        """Size PyTorch's thread pools for CPU inference."""
+        # PyTorch already defaults to the core count; only override on request,
+        # since halving cpu_count() to skip SMT siblings starves Apple Silicon
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        try:
+            # Whisper dispatches encoder layers sequentially
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work has run
+            pass
+        
+    def _cache_key(self) -> Tuple:
+        """Key identifying this configuration's model in the shared cache."""
+        return (self.backend, self.model_name, self.device, self.compute_type, str(self.models_dir))
+        
+    def _quantize_linear_layers(self):
+        """Convert the model's Linear layers to dynamic int8 for CPU inference."""
+        # Whisper subclasses nn.Linear only to cast weights to the input dtype;
+        # quantize_dynamic matches exact types, so expose them as plain Linear
+        for module in self.model.modules():
+            if type(module) is whisper.model.Linear:
+                module.__class__ = torch.nn.Linear
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("Applied dynamic int8 quantization to Linear layers")
+        
+    def _cast_to_bfloat16(self):
+        """Cast weights to bfloat16; inference then runs under autocast."""
+        self.model = self.model.to(dtype=torch.bfloat16)
+        # Whisper's decoder only accepts float16 or float32 audio features,
+        # so hand it float32 and let autocast run the matmuls in bfloat16
+        self.model.encoder.register_forward_hook(lambda module, inputs, output: output.float())
+        
+    def _compile_encoder(self):
+        """Compile the Whisper encoder with TorchInductor + CUDA graphs and warm it up."""
+        # The decoder is left eager: its KV cache grows every step, which
+        # would force a recompile / CUDA graph re-capture per token
+        eager_encoder = self.model.encoder
+        self.model.encoder = torch.compile(eager_encoder, mode="reduce-overhead", fullgraph=False)
+        try:
+            # Pay the tracing cost now rather than on the first real transcription
+            warmup_start = time.time()
+            self._run_model(np.zeros(16000 * 2, dtype=np.float32))
+            logger.info("Encoder compiled in %.2fs", time.time() - warmup_start)
+        except Exception as e:
+            logger.warning("Encoder compilation failed, using eager mode: %s", e)
+            self.model.encoder = eager_encoder
+            
+    def unload_model(self, purge: bool = False, free_cuda_cache: bool = False):
+        """
+        Unload model, keeping it in the shared cache for a fast reload.
+        
+        Args:
+            purge: Also drop the cached model so its memory can be freed
+            free_cuda_cache: Return cached CUDA blocks to the driver; this syncs
+                all streams, so by default the allocator keeps them for reuse
+        """
         if not self.is_loaded:
             return
             
+        if purge:
+            with _MODEL_CACHE_LOCK:
+                _MODEL_CACHE.pop(self._cache_key(), None)
         self.model = None
-        torch.cuda.empty_cache() if self.device == "cuda" else None
+        if free_cuda_cache and self.device == "cuda":
+            torch.cuda.empty_cache()
+            torch.cuda.ipc_collect()
         self.is_loaded = False
-        print("Model unloaded")
+        logger.info("Model unloaded")
+        
+    def _run_model(
+        self,
+        audio: Union[np.ndarray, str],
+        verbose: Optional[bool] = None,
+        streaming: bool = False
+    ) -> Dict[str, Any]:
+        """Run the loaded backend and return a Whisper-style result dict."""
+        options = STREAMING_DECODE_OPTIONS if streaming else {}
+        if isinstance(audio, np.ndarray) and self.device != "cuda":
+            # No-op for C-contiguous float32, the common case from capture.
+            # May still be a read-only recording view; the mel code copies it
+            # rather than wrapping it with torch.from_numpy
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            
+        if self.backend == "faster-whisper":
+            segments, info = self.model.transcribe(
+                audio, language=self.language, beam_size=1, **options
+            )
+            # Segments are generated lazily, decoding happens while joining
+            text = "".join(segment.text for segment in segments)
+            return {"text": text, "language": info.language}
+            
+        if self.device == "cuda" and isinstance(audio, np.ndarray):
+            audio = self._to_device(audio)
+            
+        # No autograd bookkeeping (version counters, view tracking) at all
+        with torch.inference_mode(), self._autocast():
+            return self.model.transcribe(
+                audio,
+                language=self.language,
+                fp16=self._fp16,
+                verbose=verbose,
+                **options
+            )
+        
+    def _autocast(self) -> ContextManager:
+        """Autocast context for bfloat16 inference, a no-op for other precisions."""
+        if not self._bf16:
+            return contextlib.nullcontext()
+        return torch.autocast("cuda", dtype=self._dtype)
+        
+    def _to_device(self, audio: np.ndarray) -> torch.Tensor:
+        """Copy audio to the GPU asynchronously through the pinned staging buffer."""
+        if self._pinned is None:
+            self._pinned = torch.empty(STAGING_SAMPLES, dtype=torch.float32, pin_memory=True)
+            
+        # Kept float32: Whisper's STFT runs on the raw samples and cuFFT only
+        # supports half precision for power-of-two sizes (N_FFT is 400)
+        n = len(audio)
+        gpu_audio = torch.empty(n, dtype=torch.float32, device=self.device)
+        
+        # Longer audio goes up in buffer-sized slices, so the page-locked
+        # footprint stays fixed however long the recording is
+        for start in range(0, n, STAGING_SAMPLES):
+            if self._pinned_ready is not None:
+                # Don't overwrite the buffer while the previous upload may still read it
+                self._pinned_ready.synchronize()
+            part = audio[start:start + STAGING_SAMPLES]
+            staging = self._pinned[:len(part)]
+            staging.numpy()[:] = part
+            gpu_audio[start:start + len(part)].copy_(staging, non_blocking=True)
+            self._pinned_ready = torch.cuda.Event()
+            self._pinned_ready.record()
+        return gpu_audio
+        
+    def _batched_transcribe_full(self, audio: np.ndarray) -> Dict[str, Any]:
+        """
+        Transcribe long audio as independent 30s windows, encoding several per batch.
+        
+        Unlike model.transcribe, windows are cut at fixed positions rather than
+        at decoded timestamps, so a word spanning a boundary may be split.
+        """
+        from whisper.audio import N_FRAMES, N_SAMPLES, pad_or_trim
+        
+        options = whisper.DecodingOptions(language=self.language, fp16=self._fp16, without_timestamps=True)
+        texts = []
+        
+        with torch.inference_mode(), self._autocast():
+            # One log-mel over the whole recording, padded like model.transcribe
+            # does, so the dynamic-range floor is global rather than per window
+            mel = _log_mel_spectrogram(self._to_device(audio), self.model.dims.n_mels, padding=N_SAMPLES)
+            content_frames = mel.shape[-1] - N_FRAMES
+            starts = range(0, content_frames, N_FRAMES)
+            for i in range(0, len(starts), BATCH_WINDOWS):
+                # The last window is zero-padded past the content, as in
+                # model.transcribe, not filled from the padding's floor values
+                batch = torch.stack([
+                    pad_or_trim(mel[:, start:min(start + N_FRAMES, content_frames)], N_FRAMES)
+                    for start in starts[i:i + BATCH_WINDOWS]
+                ])
+                if self._fp16:
+                    batch = batch.half()
+                    
+                # One encoder pass for the whole batch; decode() recognizes
+                # encoded features and runs the decoder over all windows at once
+                features = self._embed_batch(batch)
+                for decoded in self._decode_with_fallback(features, options):
+                    # Same silence test model.transcribe applies by default
+                    if decoded.no_speech_prob > 0.6 and decoded.avg_logprob < -1.0:
+                        continue
+                    text = decoded.text.strip()
+                    if text:
+                        texts.append(text)
+                        
+        return {"text": " ".join(texts), "language": self.language}
+        
+    def _decode_with_fallback(self, features: torch.Tensor, options: Any) -> List[Any]:
+        """Decode a batch greedily, re-decoding failed windows at rising temperatures."""
+        results = self.model.decode(features, options)
+        for i, decoded in enumerate(results):
+            for temperature in FALLBACK_TEMPERATURES:
+                if not _needs_fallback(decoded):
+                    break
+                retry = dataclasses.replace(options, temperature=temperature)
+                decoded = self.model.decode(features[i:i + 1], retry)[0]
+            results[i] = decoded
+        return results
+        
+    def _embed_batch(self, mel: torch.Tensor) -> torch.Tensor:
+        """
+        Encode a batch of mel windows with the eager encoder.
+        
+        The compiled encoder is only warmed up at batch size 1; any other size
+        would trigger a recompile and CUDA graph capture mid-request.
+        """
+        encoder = getattr(self.model.encoder, "_orig_mod", self.model.encoder)
+        return encoder(mel)
         
     def set_transcription_callback(self, callback: Callable[[str], None]):
         """Set callback for when transcription is ready."""
@@ -90,48 +482,195 @@ class Transcriber:
         Returns:
             Dictionary containing transcription result or None if error
         """
+        result = self._transcribe_impl(audio, blocking=False)
+        self._deliver_result(result)
+        return result
+        
+    def submit_transcribe(self, audio: np.ndarray) -> Future:
+        """
+        Queue audio for transcription on the background worker.
+        
+        The transcription callback runs on the worker thread once the result is
+        ready. The caller must not modify audio until the future completes.
+        
+        Args:
+            audio: Audio data as numpy array (float32, already normalized)
+            
+        Returns:
+            Future resolving to the transcription result or None if error
+        """
+        future = self._executor.submit(self._transcribe_impl, audio)
+        future.add_done_callback(self._on_transcription_done)
+        return future
+        
+    def submit_chunk(self, audio: np.ndarray) -> Future:
+        """
+        Queue a short streaming chunk to be transcribed in a micro-batch.
+        
+        Chunks arriving within CHUNK_BATCH_WINDOW of each other share one
+        encoder pass and one batched decode. Results are delivered to the
+        transcription callback like submit_transcribe. The caller must not
+        modify audio until the future completes.
+        
+        Args:
+            audio: Audio data as numpy array (float32, at most 30s)
+            
+        Returns:
+            Future resolving to the transcription result or None if error
+        """
+        if self.backend != "whisper":
+            return self.submit_transcribe(audio)
+            
+        future = Future()
+        future.add_done_callback(self._on_transcription_done)
+        with self._batch_lock:
+            self._chunk_queue.append((audio, future))
+            batch = None
+            if len(self._chunk_queue) >= CHUNK_BATCH_SIZE:
+                batch = self._take_chunk_batch()
+            elif self._batch_timer is None:
+                self._start_batch_timer()
+        if batch:
+            self._executor.submit(self._transcribe_chunk_batch, batch)
+        return future
+        
+    def _start_batch_timer(self):
+        """Flush queued chunks when the coalescing window closes (holds _batch_lock)."""
+        self._batch_timer = threading.Timer(CHUNK_BATCH_WINDOW, self._flush_chunks)
+        self._batch_timer.daemon = True
+        self._batch_timer.start()
+        
+    def _take_chunk_batch(self) -> List[Tuple[np.ndarray, Future]]:
+        """Pop up to CHUNK_BATCH_SIZE queued chunks (holds _batch_lock)."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        count = min(len(self._chunk_queue), CHUNK_BATCH_SIZE)
+        batch = [self._chunk_queue.popleft() for _ in range(count)]
+        if self._chunk_queue:
+            self._start_batch_timer()
+        return batch
+        
+    def _flush_chunks(self):
+        """Timer callback: submit whatever chunks are queued."""
+        with self._batch_lock:
+            self._batch_timer = None
+            batch = self._take_chunk_batch()
+        if batch:
+            self._executor.submit(self._transcribe_chunk_batch, batch)
+            
+    def _transcribe_chunk_batch(self, batch: List[Tuple[np.ndarray, Future]]):
+        """Transcribe a micro-batch on the worker and resolve its futures."""
+        batch = [(audio, future) for audio, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+            
+        if not self.is_loaded:
+            self.load_model()
+            
+        results = [None] * len(batch)
+        if self.is_loaded:
+            with self._lock:
+                self.is_processing = True
+                inference_start = time.time()
+                try:
+                    results = self._decode_chunks([audio for audio, _ in batch])
+                    self.last_inference_time = time.time() - inference_start
+                    logger.info("Transcribed batch of %d chunks in %.2fs", len(batch), self.last_inference_time)
+                except Exception as e:
+                    logger.exception("Batch transcription error: %s", e)
+                finally:
+                    self.is_processing = False
+                    
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+            
+    def _decode_chunks(self, chunks: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """Encode chunks as one mel batch, then decode them together greedily."""
+        from whisper.audio import N_SAMPLES
+        
+        options = whisper.DecodingOptions(language=self.language, fp16=self._fp16, without_timestamps=True)
+        n_mels = self.model.dims.n_mels
+        
+        with torch.inference_mode(), self._autocast():
+            mels = []
+            for chunk in chunks:
+                chunk = chunk[:N_SAMPLES]
+                # Zero-pad on the device to one 30s window, as model.transcribe does
+                mels.append(_log_mel_spectrogram(
+                    chunk, n_mels,
+                    padding=N_SAMPLES - len(chunk), device=self.device
+                ))
+            mel = torch.stack(mels)
+            if self._fp16:
+                mel = mel.half()
+                
+            features = self._embed_batch(mel)
+            results = []
+            for decoded in self.model.decode(features, options):
+                # Same silence test model.transcribe applies by default
+                silent = decoded.no_speech_prob > 0.6 and decoded.avg_logprob < -1.0
+                results.append({"text": "" if silent else decoded.text, "language": decoded.language})
+            return results
+            
+    def _on_transcription_done(self, future: Future):
+        """Deliver the result of a submitted transcription to the callback."""
+        if not future.cancelled() and future.exception() is None:
+            self._deliver_result(future.result())
+            
+    def _transcribe_impl(
+        self,
+        audio: np.ndarray,
+        blocking: bool = True,
+        prepare: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run a streaming transcription, waiting for the model if blocking.
+        
+        prepare, if given, maps the audio to the model input once the lock is
+        held, so it may write into buffers shared with other callers.
+        """
         if not self.is_loaded:
             self.load_model()
             
-        if not self.is_loaded or self.is_processing:
-            print("Model not loaded or already processing, skipping transcription")
+        # Release the lock we took even if load_model swaps self._lock
+        lock = self._lock
+        if not self.is_loaded or not lock.acquire(blocking=blocking):
+            logger.warning("Model not loaded or already processing, skipping transcription")
             return None
             
         self.is_processing = True
         inference_start = time.time()
         
         try:
-            print(f"Starting transcription of audio with shape {audio.shape}")
+            if prepare is not None:
+                audio = prepare(audio)
+            logger.info("Starting transcription of audio with shape %s", audio.shape)
             
-            # Transcribe
-            result = self.model.transcribe(
-                audio,
-                language=self.language,
-                fp16=(self.compute_type == "float16" and self.device == "cuda")
-            )
+            # Transcribe, trading offline decoding quality for bounded latency
+            result = self._run_model(audio, streaming=True)
             
             inference_time = time.time() - inference_start
             self.last_inference_time = inference_time
-            print(f"Transcription completed in {inference_time:.2f}s")
-            print(f"Raw result: {result['text']}")
-            
-            # Call callback if provided
-            if self.transcription_callback and result and "text" in result:
-                text = result["text"].strip()
-                if text:
-                    print(f"Calling callback with: '{text}'")
-                    self.transcription_callback(text)
-                else:
-                    print("Empty transcription result, not calling callback")
-                
+            logger.info("Transcription completed in %.2fs", inference_time)
+            logger.info("Raw result: %s", result['text'])
             return result
         except Exception as e:
-            print(f"Transcription error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Transcription error: %s", e)
             return None
         finally:
             self.is_processing = False
+            lock.release()
+            
+    def _deliver_result(self, result: Optional[Dict[str, Any]]):
+        """Call the transcription callback with the result text, if any."""
+        if self.transcription_callback and result and "text" in result:
+            text = result["text"].strip()
+            if text:
+                logger.info("Calling callback with: '%s'", text)
+                self.transcription_callback(text)
+            else:
+                logger.info("Empty transcription result, not calling callback")
     
     def transcribe_full_recording(self, audio: np.ndarray) -> Optional[Dict[str, Any]]:
         """
@@ -146,8 +685,9 @@ class Transcriber:
         if not self.is_loaded:
             self.load_model()
             
-        if not self.is_loaded or self.is_processing:
-            print("Model not loaded or already processing, skipping transcription")
+        lock = self._lock
+        if not self.is_loaded or not lock.acquire(blocking=False):
+            logger.warning("Model not loaded or already processing, skipping transcription")
             return None
             
         self.is_processing = True
@@ -155,22 +695,25 @@ class Transcriber:
         
         try:
             audio_duration = len(audio) / 16000  # Assuming 16kHz sample rate
-            print(f"Starting transcription of full recording: {audio_duration:.2f} seconds")
+            logger.info("Starting transcription of full recording: %.2f seconds", audio_duration)
             
-            # Transcribe full recording at once
-            result = self.model.transcribe(
-                audio,
-                language=self.language,
-                fp16=(self.compute_type == "float16" and self.device == "cuda"),
-                verbose=True  # Enable Whisper's progress display for long files
-            )
+            if (self.device == "cuda" and self.backend == "whisper"
+                    and audio_duration > BATCHED_MIN_DURATION):
+                # Long recording: batch the encoder over fixed 30s windows
+                result = self._batched_transcribe_full(audio)
+            else:
+                # Transcribe full recording at once
+                result = self._run_model(
+                    audio,
+                    verbose=False  # Progress bar only, no per-segment printing
+                )
             
             inference_time = time.time() - inference_start
             self.last_inference_time = inference_time
             
-            print(f"Full transcription completed in {inference_time:.2f}s")
+            logger.info("Full transcription completed in %.2fs", inference_time)
             if result and "text" in result:
-                print(f"Transcription complete: {len(result['text'])} characters")
+                logger.info("Transcription complete: %d characters", len(result['text']))
                 
                 # Call callback if provided
                 if self.transcription_callback and result["text"].strip():
@@ -178,12 +721,11 @@ class Transcriber:
                 
             return result
         except Exception as e:
-            print(f"Transcription error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Transcription error: %s", e)
             return None
         finally:
             self.is_processing = False
+            lock.release()
             
     def transcribe_file(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
         """
@@ -198,8 +740,9 @@ class Transcriber:
         if not self.is_loaded:
             self.load_model()
             
-        if not self.is_loaded or self.is_processing:
-            print("Model not loaded or already processing, skipping transcription")
+        lock = self._lock
+        if not self.is_loaded or not lock.acquire(blocking=False):
+            logger.warning("Model not loaded or already processing, skipping transcription")
             return None
             
         self.is_processing = True
@@ -207,26 +750,27 @@ class Transcriber:
         
         try:
             file_path = str(file_path)
-            print(f"Starting transcription of file: {file_path}")
+            logger.info("Starting transcription of file: %s", file_path)
             
             if not os.path.exists(file_path):
-                print(f"File not found: {file_path}")
+                logger.error("File not found: %s", file_path)
                 return None
                 
+            # Decode WAVs in-process, anything else goes through Whisper's ffmpeg
+            audio = _read_wav(file_path)
+            
             # Transcribe file 
-            result = self.model.transcribe(
-                file_path,
-                language=self.language,
-                fp16=(self.compute_type == "float16" and self.device == "cuda"),
-                verbose=True
+            result = self._run_model(
+                audio if audio is not None else file_path,
+                verbose=False  # Progress bar only
             )
             
             inference_time = time.time() - inference_start
             self.last_inference_time = inference_time
             
-            print(f"File transcription completed in {inference_time:.2f}s")
+            logger.info("File transcription completed in %.2fs", inference_time)
             if result and "text" in result:
-                print(f"Transcription complete: {len(result['text'])} characters")
+                logger.info("Transcription complete: %d characters", len(result['text']))
                 
                 # Call callback if provided
                 if self.transcription_callback and result["text"].strip():
@@ -234,24 +778,33 @@ class Transcriber:
                 
             return result
         except Exception as e:
-            print(f"File transcription error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("File transcription error: %s", e)
             return None
         finally:
             self.is_processing = False
+            lock.release()
             
     def process_audio(self, audio: np.ndarray):
         """Process audio chunk and handle transcription."""
-        # Convert to float32 normalized between -1 and 1
-        if audio.dtype != np.float32:
-            float_data = audio.astype(np.float32)
-        else:
-            float_data = audio
-            
-        # Ensure audio is properly normalized
-        if float_data.max() > 1.0 or float_data.min() < -1.0:
-            float_data = np.clip(float_data / max(abs(float_data.max()), abs(float_data.min())), -1.0, 1.0)
-            
-        # Transcribe
-        return self.transcribe(float_data)
\ No newline at end of file
+        # Normalize only once the model is ours: the scratch is shared, so a
+        # caller that will be skipped must not overwrite in-flight input
+        result = self._transcribe_impl(audio, blocking=False, prepare=self._normalize)
+        self._deliver_result(result)
+        return result
+        
+    def _normalize(self, audio: np.ndarray) -> np.ndarray:
+        """Copy audio into the reused scratch, scaled into [-1, 1] (holds _lock)."""
+        # Copy into the reused float32 scratch, grown only for chunks over 30s
+        n = len(audio)
+        if n > self._audio_scratch.size:
+            self._audio_scratch = np.zeros(n, dtype=np.float32)
+        float_data = self._audio_scratch[:n]
+        np.copyto(float_data, audio, casting='unsafe')
+            
+        # Normalize between -1 and 1 in place, dividing by the true peak
+        # already bounds it to [-1, 1] so no clip pass is needed. Two
+        # reductions, but no |x| temporary
+        peak = max(-float_data.min(), float_data.max()) if float_data.size else 0.0
+        if peak > 1.0:
+            np.multiply(float_data, 1.0 / peak, out=float_data)
+        return float_data